@@ -0,0 +1,111 @@
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        # Plain-Python fallback: same call signature, no compilation
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+# =========================================================
+# MACD STATUS CODES
+# =========================================================
+
+MACD_NEGATIVE = 0
+MACD_POSITIVE = 1
+MACD_EXPANSION = 2
+MACD_EARLY_EXPANSION = 3
+
+MACD_LABELS = np.array(["Negative", "Positive", "Expansion", "Early Expansion"])
+
+
+# =========================================================
+# EMA STEP (ewm(adjust=False) incl. NaN gaps)
+# =========================================================
+
+@njit(cache=True)
+def _ema_step(prev, old_wt, cur, alpha):
+
+    if prev != prev:
+        return cur, old_wt
+
+    old_wt *= 1.0 - alpha
+
+    if cur != cur:
+        return prev, old_wt
+
+    return (old_wt * prev + alpha * cur) / (old_wt + alpha), 1.0
+
+
+# =========================================================
+# MACD KERNEL
+# =========================================================
+
+# fastmath is left off on purpose: it lets LLVM assume no NaNs, which
+# would drop the gap handling in _ema_step. No explicit signature either,
+# since pandas hands back read-only / Fortran-ordered views.
+@njit(parallel=True, cache=True)
+def _macd_codes_jit(closes):
+
+    n_rows, n_cols = closes.shape
+    codes = np.empty(n_rows, dtype=np.int8)
+
+    a12 = 2.0 / 13.0
+    a26 = 2.0 / 27.0
+    a9 = 2.0 / 10.0
+
+    for i in prange(n_rows):
+
+        e12 = closes[i, 0]
+        e26 = closes[i, 0]
+        w12 = 1.0
+        w26 = 1.0
+
+        sig = e12 - e26
+        w9 = 1.0
+
+        prev_hist = np.nan
+        last_hist = (e12 - e26) - sig
+
+        for t in range(1, n_cols):
+            cur = closes[i, t]
+            e12, w12 = _ema_step(e12, w12, cur, a12)
+            e26, w26 = _ema_step(e26, w26, cur, a26)
+
+            macd = e12 - e26
+            sig, w9 = _ema_step(sig, w9, macd, a9)
+
+            prev_hist = last_hist
+            last_hist = macd - sig
+
+        if last_hist > 0 and prev_hist <= 0:
+            codes[i] = MACD_EARLY_EXPANSION
+        elif last_hist > prev_hist and prev_hist > 0:
+            codes[i] = MACD_EXPANSION
+        elif last_hist > 0:
+            codes[i] = MACD_POSITIVE
+        else:
+            codes[i] = MACD_NEGATIVE
+
+    return codes
+
+
+# =========================================================
+# KERNEL SELECTION
+# =========================================================
+
+# Prefer the ahead-of-time build from build_ext.py: no JIT compile on
+# the first page load, and it runs without numba installed.
+try:
+    from macd_native import macd_codes
+    HAVE_KERNEL = True
+except ImportError:
+    macd_codes = _macd_codes_jit
+    HAVE_KERNEL = HAVE_NUMBA
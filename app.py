@@ -1,14 +1,16 @@
 import streamlit as st
 from datetime import datetime
+from streamlit_autorefresh import st_autorefresh
 
 from legacy_logic import (
     load_data,
     build_swing_table,
     build_positional_table,
-    near_miss_filter,
+    build_near_miss_table,
     metadata_footer,
-    color_macd,
-    color_trend,
+    style_macd_col,
+    style_trend_col,
+    NUM_FORMAT,
 )
 
 # --------------------------------------------------
@@ -18,13 +20,27 @@ from legacy_logic import (
 st.set_page_config(page_title="Legacy Trading Console", layout="wide")
 st.title("📊 Legacy Template — Production Dashboard")
 
+# --------------------------------------------------
+# AUTO REFRESH (MARKET HOURS)
+# --------------------------------------------------
+
+# Client-side timer: the browser triggers the rerun, so no worker thread
+# is held between refreshes. Matches the 15-minute data cache TTL.
+now = datetime.now()
+if 9 <= now.hour < 15:
+    st_autorefresh(interval=15 * 60 * 1000, key="nse_refresh")
+
 # --------------------------------------------------
 # DATA SOURCE
 # --------------------------------------------------
 
 DATA_PATH = "https://docs.google.com/spreadsheets/d/1mKkUz7qQlZr8KqCtIOQuBw2mbUEGlgel/export?format=xlsx"
 
-df = load_data(DATA_PATH)
+try:
+    df = load_data(DATA_PATH)
+except Exception as e:
+    st.error("Data loading failed.")
+    st.stop()
 
 # --------------------------------------------------
 # BUILD TABLES (NO DOUBLE FILTERING)
@@ -33,46 +49,19 @@ df = load_data(DATA_PATH)
 swing_table = build_swing_table(df)
 pos_table = build_positional_table(df)
 
-near_df = near_miss_filter(df)
-
-# Build near-miss table inline (cleaned format)
-near_df = near_df.copy().reset_index(drop=True)
-near_df["Rank"] = near_df.index + 1
-
-near_table = near_df.rename(columns={
-    "symbol": "Symbol",
-    "macd_status": "MACD Status",
-    "price": "Price",
-    "pct_chg": "% Chg",
-    "adr": "ADR %",
-    "liquidity": "Liquidity",
-    "sector": "Sector",
-    "Rank": "Rank"
-})[[
-    "Rank","Symbol","MACD Status","Price","% Chg","ADR %","Liquidity","Sector"
-]]
+near_table = build_near_miss_table(df)
 
 # --------------------------------------------------
 # DISPLAY
 # --------------------------------------------------
 
-# ---------- Number Formatting ----------
-num_format = {
-    "Score": "{:.2f}",
-    "Price": "{:.2f}",
-    "% Chg": "{:.2f}",
-    "ADR %": "{:.2f}",
-    "Liquidity": "{:,.2f}",
-    "SL (₹)": "{:.2f}",
-}
-
 # ---------- Swing Table ----------
 st.subheader("🚀 Swing Candidates")
 
 st.dataframe(
     swing_table.style
-        .applymap(color_macd, subset=["MACD Status"])
-        .format(num_format),
+        .apply(style_macd_col, subset=["MACD Status"])
+        .format(NUM_FORMAT),
     use_container_width=True
 )
 
@@ -81,16 +70,19 @@ st.subheader("📈 Top Positional Opportunities")
 
 st.dataframe(
     pos_table.style
-        .applymap(color_macd, subset=["MACD Status"])
-        .applymap(color_trend, subset=["Trend Strength"])
-        .format(num_format),
+        .apply(style_macd_col, subset=["MACD Status"])
+        .apply(style_trend_col, subset=["Trend Strength"])
+        .format(NUM_FORMAT),
     use_container_width=True
 )
 
 
 
 st.subheader("⚠️ Near-Miss Swing")
-st.dataframe(near_table, use_container_width=True)
+st.dataframe(
+    near_table.style.format(NUM_FORMAT),
+    use_container_width=True
+)
 
 # --------------------------------------------------
 # METADATA
@@ -104,9 +96,3 @@ st.subheader("Run Metadata")
 for k, v in meta.items():
     st.write(f"**{k}:** {v}")
 
-
-try:
-    df = load_data(DATA_PATH)
-except Exception as e:
-    st.error("Data loading failed.")
-    st.stop()
@@ -0,0 +1,23 @@
+# Ahead-of-time build of the MACD kernel, run once at deploy time:
+#
+#     python build_ext.py
+#
+# Produces macd_native.*.so next to this file. _macd_njit picks it up
+# when present, so the first dashboard load doesn't pay the JIT compile.
+# pycc has no parallel mode; the exported kernel runs its rows serially.
+
+import os
+
+from numba.pycc import CC
+
+from _macd_njit import _macd_codes_jit
+
+
+cc = CC("macd_native")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export("macd_codes", "int8[:](float64[:,:])")(_macd_codes_jit.py_func)
+
+
+if __name__ == "__main__":
+    cc.compile()
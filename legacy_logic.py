@@ -1,18 +1,90 @@
+import hashlib
+import os
+import tempfile
+import time
+from collections import namedtuple
+from functools import lru_cache
+
 import pandas as pd
 import numpy as np
+import streamlit as st
 from datetime import datetime
 
+from _macd_njit import (
+    HAVE_KERNEL,
+    MACD_LABELS,
+    MACD_NEGATIVE,
+    MACD_POSITIVE,
+    MACD_EXPANSION,
+    MACD_EARLY_EXPANSION,
+    macd_codes,
+)
+
 
 # =========================================================
 # LOAD & STANDARDIZE DATA
 # =========================================================
 
+PARQUET_CACHE_TTL = 900
+
+# Bump whenever the cached frame's layout changes, so files left by an
+# older deploy are never read back as the current format
+PARQUET_CACHE_VERSION = 3
+
+CACHE_COLUMNS = [
+    "symbol", "adr", "liquidity", "price", "pct_chg", "sector", "macd_status"
+]
+
+
+def _parquet_cache_path(path: str) -> str:
+
+    key = hashlib.sha1(path.encode()).hexdigest()
+    return os.path.join(
+        tempfile.gettempdir(),
+        f"legacy_v{PARQUET_CACHE_VERSION}_{key}.parquet"
+    )
+
+
+def _parquet_cache_fresh(path: str, cache_path: str) -> bool:
+
+    if not os.path.exists(cache_path):
+        return False
+
+    cached_at = os.path.getmtime(cache_path)
+
+    # Local sources invalidate as soon as the file changes
+    if os.path.exists(path) and os.path.getmtime(path) > cached_at:
+        return False
+
+    return time.time() - cached_at < PARQUET_CACHE_TTL
+
+
+@st.cache_data(ttl=900, show_spinner=False)
 def load_data(path: str) -> pd.DataFrame:
 
+    # The side-cache holds the finished frame, macd_status included,
+    # so a warm load skips the fetch, the parse and the EMA pass.
+    cache_path = _parquet_cache_path(path)
+
+    if _parquet_cache_fresh(path, cache_path):
+        try:
+            df = pd.read_parquet(cache_path)
+        except Exception:
+            df = None
+
+        if df is not None and all(c in df.columns for c in CACHE_COLUMNS):
+            return df
+
+        # Truncated, corrupt or foreign cache: drop it and rebuild
+        try:
+            os.remove(cache_path)
+        except OSError:
+            pass
+
     if path.endswith(".csv"):
         df = pd.read_csv(path)
     else:
-        df = pd.read_excel(path)
+        df = pd.read_excel(path, engine="calamine")
 
     # ---- Normalize column names ----
     df.columns = (
@@ -38,28 +110,80 @@ def load_data(path: str) -> pd.DataFrame:
     required = ["symbol", "adr", "liquidity", "price", "pct_chg", "sector"]
     for col in required:
         if col not in df.columns:
-            df[col] = 0
+            df[col] = "" if col in ("symbol", "sector") else 0
 
     df = compute_macd_status(df)
+    df = downcast_frame(df)
+
+    # Side-cache is best effort; a sheet pyarrow can't type still loads.
+    # Written beside the live file and swapped in, so a crash or a
+    # concurrent reader never sees a half-written cache.
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(cache_path), suffix=".parquet.tmp"
+        )
+        os.close(fd)
+        df.to_parquet(tmp_path, compression="snappy")
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    return df
+
+
+def downcast_frame(df: pd.DataFrame) -> pd.DataFrame:
+
+    # Floats stay float64: every one of them feeds a rule cut (score
+    # 70/75/80/85, SL, volume multiples) and float32 moves two-decimal
+    # inputs far enough to land on the other side of one.
+    #
+    # The filter/score inputs must end up numeric whatever the sheet gave:
+    # text cells become NaN, zero-filled placeholders become floats
+    for col in ["liquidity", "adr", "pct_chg", "price"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype(np.float64)
+
+    for col in df.select_dtypes(include="int64").columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+
+    # Symbols are unique per row, so a categorical buys nothing there;
+    # keep them as one contiguous Arrow string buffer instead
+    df["symbol"] = df["symbol"].astype("string[pyarrow]")
+    df["sector"] = df["sector"].astype("category")
 
     return df
 
 
 # =========================================================
-# CLOSE SERIES HELPER
+# HISTORY COLUMN ORDER (oldest -> latest)
 # =========================================================
 
-def get_close_series(row):
+@lru_cache(maxsize=32)
+def _history_columns(columns: tuple, prefix: str) -> list:
 
-    close_cols = [c for c in row.index if c.startswith("close")]
+    # Resolved once per column layout instead of once per row
+    cols = [c for c in columns if c.startswith(prefix)]
 
     def extract_number(col):
-        if col == "close":
+        if col == prefix:
             return 0
         digits = ''.join(filter(str.isdigit, col))
         return int(digits) if digits else 0
 
-    close_cols_sorted = sorted(close_cols, key=extract_number, reverse=True)
+    return sorted(cols, key=extract_number, reverse=True)
+
+
+# =========================================================
+# CLOSE SERIES HELPER
+# =========================================================
+
+def get_close_series(row):
+
+    close_cols_sorted = _history_columns(tuple(row.index), "close")
     closes = row[close_cols_sorted].astype(float).values
 
     return pd.Series(closes)
@@ -70,15 +194,7 @@ def get_close_series(row):
 
 def get_volume_series(row):
 
-    vol_cols = [c for c in row.index if c.startswith("volume")]
-
-    def extract_number(col):
-        if col == "volume":
-            return 0
-        digits = ''.join(filter(str.isdigit, col))
-        return int(digits) if digits else 0
-
-    vol_cols_sorted = sorted(vol_cols, key=extract_number, reverse=True)
+    vol_cols_sorted = _history_columns(tuple(row.index), "volume")
     volumes = row[vol_cols_sorted].astype(float).values
 
     return pd.Series(volumes)
@@ -177,95 +293,219 @@ def compute_entry_signal(row):
 
 def compute_macd_status(df: pd.DataFrame) -> pd.DataFrame:
 
-    close_cols = [c for c in df.columns if c.startswith("close")]
+    close_cols_sorted = _history_columns(tuple(df.columns), "close")
 
-    if len(close_cols) < 26:
-        df["macd_status"] = "Negative"
+    if len(close_cols_sorted) < 26:
+        df["macd_status"] = pd.Categorical.from_codes(
+            np.full(len(df), MACD_NEGATIVE, dtype=np.int8), categories=MACD_LABELS
+        )
         return df
 
-    def extract_number(col):
-        if col == "close":
-            return 0
-        digits = ''.join(filter(str.isdigit, col))
-        return int(digits) if digits else 0
+    # One bulk extract; stray text cells become NaN, which the EMA skips
+    closes = (
+        df[close_cols_sorted]
+        .apply(pd.to_numeric, errors="coerce")
+        .to_numpy(dtype=np.float64)
+    )
+
+    if HAVE_KERNEL:
+        df["macd_status"] = pd.Categorical.from_codes(
+            macd_codes(closes), categories=MACD_LABELS
+        )
+        return df
 
-    close_cols_sorted = sorted(close_cols, key=extract_number, reverse=True)
+    ema12 = _ema_axis1(closes, 12)
+    ema26 = _ema_axis1(closes, 26)
+    macd = ema12 - ema26
+    signal = _ema_axis1(macd, 9)
+    hist = macd - signal
+
+    last_hist = hist[:, -1]
+    prev_hist = hist[:, -2]
+
+    # Same code table as the Numba kernel, so both paths share MACD_LABELS
+    codes = np.where(
+        (last_hist > 0) & (prev_hist <= 0), MACD_EARLY_EXPANSION,
+        np.where(
+            (last_hist > prev_hist) & (prev_hist > 0), MACD_EXPANSION,
+            np.where(last_hist > 0, MACD_POSITIVE, MACD_NEGATIVE)
+        )
+    ).astype(np.int8)
+
+    df["macd_status"] = pd.Categorical.from_codes(codes, categories=MACD_LABELS)
+    return df
 
-    macd_results = []
 
-    for _, row in df.iterrows():
+def _ema_axis1(arr, span):
 
-        closes = row[close_cols_sorted].astype(float).values
-        series = pd.Series(closes)
+    # Same recurrence as ewm(span, adjust=False), run down every row at once.
+    # NaN gaps are weighted the way pandas does it (decay the old weight,
+    # carry the last value forward) so short histories classify identically.
+    alpha = 2 / (span + 1)
+    beta = 1 - alpha
 
-        ema12 = series.ewm(span=12, adjust=False).mean()
-        ema26 = series.ewm(span=26, adjust=False).mean()
-        macd = ema12 - ema26
-        signal = macd.ewm(span=9, adjust=False).mean()
-        hist = macd - signal
+    out = np.empty_like(arr)
+    out[:, 0] = arr[:, 0]
 
-        last_hist = hist.iloc[-1]
-        prev_hist = hist.iloc[-2]
+    if not np.isnan(arr).any():
+        # Gap-free history (the usual case): plain recurrence written in
+        # place, one scratch row instead of fresh temporaries per step
+        decay = np.empty(arr.shape[0], dtype=arr.dtype)
+        for t in range(1, arr.shape[1]):
+            np.multiply(arr[:, t], alpha, out=out[:, t])
+            np.multiply(out[:, t - 1], beta, out=decay)
+            out[:, t] += decay
+        return out
 
-        if last_hist > 0 and prev_hist <= 0:
-            macd_results.append("Early Expansion")
-        elif last_hist > prev_hist > 0:
-            macd_results.append("Expansion")
-        elif last_hist > 0:
-            macd_results.append("Positive")
-        else:
-            macd_results.append("Negative")
+    old_wt = np.ones(arr.shape[0], dtype=arr.dtype)
 
-    df["macd_status"] = macd_results
-    return df
+    for t in range(1, arr.shape[1]):
+        prev = out[:, t - 1]
+        cur = arr[:, t]
+
+        seen = ~np.isnan(prev)
+        both = seen & ~np.isnan(cur)
+
+        old_wt = np.where(seen, old_wt * beta, old_wt)
+        blended = (old_wt * prev + alpha * cur) / (old_wt + alpha)
+
+        out[:, t] = np.where(both, blended, np.where(seen, prev, cur))
+        old_wt = np.where(both, 1.0, old_wt)
+
+    return out
+
+
+# =========================================================
+# MACD MEMBERSHIP & LOOKUP
+# =========================================================
+
+BULLISH_MACD = ["Early Expansion", "Expansion", "Positive"]
+
+
+def macd_in(status: pd.Series, labels) -> np.ndarray:
+
+    # Compare int8 category codes rather than hashing label strings
+    if isinstance(status.dtype, pd.CategoricalDtype):
+        allowed = status.cat.categories.get_indexer(labels)
+        return np.isin(status.cat.codes.to_numpy(), allowed[allowed >= 0])
+
+    return status.isin(labels).to_numpy()
+
+
+def macd_lookup(status: pd.Series, table: dict, default) -> np.ndarray:
+
+    # One gather through a per-category table instead of a dict lookup
+    # per row
+    if isinstance(status.dtype, pd.CategoricalDtype):
+        return _macd_points(status, table, default)[status.cat.codes.to_numpy()]
+
+    return status.map(table).fillna(default).to_numpy(dtype=np.float64)
+
+
+def _macd_points(status: pd.Series, table: dict, default) -> np.ndarray:
+
+    # Indexed by category code; the trailing slot catches code -1
+    # (missing status)
+    return np.array(
+        [table.get(c, default) for c in status.cat.categories] + [default],
+        dtype=np.float64
+    )
+
+
+# =========================================================
+# SCREEN ARRAYS
+# =========================================================
+
+Prep = namedtuple("Prep", ["liq", "adr", "liq_ok", "macd_pos"])
+
+
+def _prep(df: pd.DataFrame) -> Prep:
+
+    # Pull the screening columns and shared masks out once; the filters
+    # and table builders all index into these arrays
+    status = df["macd_status"]
+    liq = df["liquidity"].to_numpy()
+
+    return Prep(
+        liq=liq,
+        adr=df["adr"].to_numpy(),
+        liq_ok=liq >= 100,
+        macd_pos=macd_in(status, BULLISH_MACD),
+    )
 
 
 # =========================================================
 # SWING FILTER
 # =========================================================
 
+def _swing_rows(p: Prep) -> np.ndarray:
+
+    return np.flatnonzero(p.liq_ok & (p.adr >= 2.5) & p.macd_pos)
+
+
 def swing_filter(df: pd.DataFrame) -> pd.DataFrame:
 
-    return df[
-        (df["liquidity"] >= 100) &
-        (df["adr"] >= 2.5) &
-        (df["macd_status"].isin(["Early Expansion", "Expansion", "Positive"]))
-    ].copy()
+    return df.take(_swing_rows(_prep(df)))
 
 
 # =========================================================
 # SCORING ENGINES (UNCHANGED)
 # =========================================================
 
+# Row-wise versions are kept as the reference the *_vec column
+# versions used by the table builders must agree with.
+
+SWING_MACD_SCORE = {
+    "Expansion": 30,
+    "Positive": 25,
+    "Early Expansion": 20
+}
+
+POSITIONAL_MACD_SCORE = {
+    "Expansion": 25,
+    "Early Expansion": 22,
+    "Positive": 18,
+    "Negative": 5
+}
+
+
 def compute_swing_score(row):
 
     liquidity_score = min(row["liquidity"] / 1000, 1) * 30
     adr_score = min(row["adr"] / 5, 1) * 25
 
-    macd_map = {
-        "Expansion": 30,
-        "Positive": 25,
-        "Early Expansion": 20
-    }
-
-    macd_score = macd_map.get(row["macd_status"], 0)
+    macd_score = SWING_MACD_SCORE.get(row["macd_status"], 0)
 
     return round(liquidity_score + adr_score + macd_score + 15, 2)
 
 
+def _round2(x: np.ndarray) -> np.ndarray:
+
+    # np.round scales by 100 first, and the scaled value can land on the
+    # other side of .5 from the exact one (77.755 -> 77.76, where
+    # round() gives 77.75). Settle those few near-ties with round().
+    scaled = x * 100
+    out = np.rint(scaled) / 100
+    tie = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    out[tie] = [round(v, 2) for v in x[tie].tolist()]
+    return out
+
+
+def compute_swing_score_vec(df: pd.DataFrame) -> np.ndarray:
+
+    liquidity_score = np.minimum(df["liquidity"].to_numpy(dtype=np.float64) / 1000, 1) * 30
+    adr_score = np.minimum(df["adr"].to_numpy(dtype=np.float64) / 5, 1) * 25
+    macd_score = macd_lookup(df["macd_status"], SWING_MACD_SCORE, 0)
+
+    return _round2(liquidity_score + adr_score + macd_score + 15)
+
+
 def compute_positional_score(row):
 
     liquidity_score = min(row["liquidity"] / 2000, 1) * 30
     adr_score = min(row["adr"] / 5, 1) * 15
 
-    macd_map = {
-        "Expansion": 25,
-        "Early Expansion": 22,
-        "Positive": 18,
-        "Negative": 5
-    }
-
-    macd_score = macd_map.get(row["macd_status"], 5)
+    macd_score = POSITIONAL_MACD_SCORE.get(row["macd_status"], 5)
 
     suitability_score = 10 if row["macd_status"] == "Negative" else 30
 
@@ -277,10 +517,38 @@ def compute_positional_score(row):
     return round(total_score, 2)
 
 
+def compute_positional_score_vec(df: pd.DataFrame) -> np.ndarray:
+
+    negative = macd_in(df["macd_status"], ["Negative"])
+
+    liquidity_score = np.minimum(df["liquidity"].to_numpy(dtype=np.float64) / 2000, 1) * 30
+    adr_score = np.minimum(df["adr"].to_numpy(dtype=np.float64) / 5, 1) * 15
+    macd_score = macd_lookup(df["macd_status"], POSITIONAL_MACD_SCORE, 5)
+    suitability_score = np.where(negative, 10, 30)
+
+    total_score = liquidity_score + adr_score + macd_score + suitability_score
+    total_score = np.where(negative, np.minimum(total_score, 60), total_score)
+
+    return _round2(total_score)
+
+
 # =========================================================
 # TRADE STYLE (STANDARDIZED)
 # =========================================================
 
+# Row-wise reference rules; the *_vec versions apply the same cascade
+# with np.select for the table builders
+
+SWING_STYLE_LABELS = [
+    "Volatility Expansion", "Breakout Setup",
+    "Momentum Expansion", "Trend Continuation"
+]
+
+POSITIONAL_STYLE_LABELS = [
+    "Weak Structure", "Structural Trend",
+    "Positional Momentum", "Accumulation Phase"
+]
+
 def classify_swing_trade_style(row):
 
     if row["macd_status"] in ["Expansion", "Positive"] and row["adr"] >= 5:
@@ -295,6 +563,23 @@ def classify_swing_trade_style(row):
     return "Trend Continuation"
 
 
+def classify_swing_trade_style_vec(df: pd.DataFrame) -> np.ndarray:
+
+    macd = df["macd_status"]
+    adr = df["adr"].to_numpy()
+    pct = df["pct_chg"].to_numpy()
+
+    return np.select(
+        [
+            macd_in(macd, ["Expansion", "Positive"]) & (adr >= 5),
+            macd_in(macd, ["Expansion", "Early Expansion"]) & (pct >= 2),
+            macd_in(macd, ["Early Expansion"]),
+        ],
+        ["Volatility Expansion", "Breakout Setup", "Momentum Expansion"],
+        default="Trend Continuation"
+    )
+
+
 def classify_positional_trade_style(row):
 
     if row["macd_status"] == "Negative":
@@ -308,6 +593,22 @@ def classify_positional_trade_style(row):
 
     return "Accumulation Phase"
 
+
+def classify_positional_trade_style_vec(df: pd.DataFrame, score: np.ndarray) -> np.ndarray:
+
+    macd = df["macd_status"]
+
+    return np.select(
+        [
+            macd_in(macd, ["Negative"]),
+            (score >= 85) & macd_in(macd, ["Expansion", "Positive"]),
+            score >= 75,
+        ],
+        ["Weak Structure", "Structural Trend", "Positional Momentum"],
+        default="Accumulation Phase"
+    )
+
+
 # =========================================================
 # TRADE BIAS (FULL STRUCTURE – SHORT LABELS)
 # =========================================================
@@ -353,46 +654,87 @@ def classify_positional_trade_bias(row):
 
     return "Bullish"
 
+# =========================================================
+# DISPLAY TABLE HELPER
+# =========================================================
+
+SWING_COLUMNS = [
+    "Symbol","Trade Bias","Trade Style","MACD Status",
+    "Score","Price","% Chg","Entry (₹)","SL (₹)","Signal",
+    "Inst Accum","ADR %","Liquidity","Sector"
+]
+
+POSITIONAL_COLUMNS = [
+    "Symbol","Trade Bias","Trade Style","MACD Status",
+    "VCP Status",
+    "Score","Price","% Chg","ADR %","Liquidity",
+    "Trend Strength","Portfolio Action","Sector"
+]
+
+NEAR_MISS_COLUMNS = [
+    "Symbol","MACD Status","Price","% Chg","ADR %","Liquidity","Sector"
+]
+
+
+def _display_table(df, extra, columns, sort_by=None):
+
+    # Columns every table shows straight from the source frame; each
+    # builder only supplies what it computes itself. The string and label
+    # columns go through as .array so the Arrow strings and categorical
+    # codes are not expanded back into object strings.
+    data = {
+        "Symbol": df["symbol"].array,
+        "MACD Status": df["macd_status"].array,
+        "Price": df["price"].to_numpy(),
+        "% Chg": df["pct_chg"].to_numpy(),
+        "ADR %": df["adr"].to_numpy(),
+        "Liquidity": df["liquidity"].to_numpy(),
+        "Sector": df["sector"].array,
+    }
+    data.update(extra)
+
+    table = pd.DataFrame(data, columns=columns)
+
+    if sort_by is not None:
+        order = np.argsort(-table[sort_by].to_numpy(), kind="stable")
+        table = table.take(order)
+        table.index = pd.RangeIndex(len(table))
+
+    table.insert(0, "Rank", np.arange(1, len(table) + 1, dtype=np.int32))
+
+    return table
+
+
 # =========================================================
 # SWING TABLE
 # =========================================================
 
+@st.cache_data(ttl=900, show_spinner=False)
 def build_swing_table(df: pd.DataFrame) -> pd.DataFrame:
 
-    df = swing_filter(df)
+    p = _prep(df)
+    rows = _swing_rows(p)
+    df = df.take(rows)
 
-    df["score"] = df.apply(compute_swing_score, axis=1)
-    df["trade_bias"] = df.apply(classify_swing_trade_bias, axis=1)
-    df["trade_style"] = df.apply(classify_swing_trade_style, axis=1)
+    # --- Score & Trade Style ---
+    score = compute_swing_score_vec(df)
+    trade_style = pd.Categorical(
+        classify_swing_trade_style_vec(df), categories=SWING_STYLE_LABELS
+    )
 
+    # --- Bias & Entry (need the close history per row) ---
+    trade_bias = df.apply(classify_swing_trade_bias, axis=1)
     entries = df.apply(compute_entry_signal, axis=1)
 
-    df["Entry (₹)"] = [e[0] for e in entries]
-    df["SL (₹)"] = [e[1] for e in entries]
-    df["Signal"] = [e[2] for e in entries]
-    df["Inst Accum"] = [e[3] for e in entries]
-    
-    
-    df = df.sort_values("score", ascending=False).reset_index(drop=True)
-    df["rank"] = df.index + 1
-
-    return df.rename(columns={
-    "symbol": "Symbol",
-    "macd_status": "MACD Status",
-    "score": "Score",
-    "price": "Price",
-    "pct_chg": "% Chg",
-    "adr": "ADR %",
-    "liquidity": "Liquidity",
-    "sector": "Sector",
-    "trade_bias": "Trade Bias",
-    "trade_style": "Trade Style",
-    "rank": "Rank"
-})[[
-    "Rank","Symbol","Trade Bias","Trade Style","MACD Status",
-    "Score","Price","% Chg","Entry (₹)","SL (₹)","Signal",
-    "Inst Accum","ADR %","Liquidity","Sector"
-]]
+    return _display_table(df, {
+        "Trade Bias": trade_bias.to_numpy(),
+        "Trade Style": trade_style,
+        "Score": score,
+        "Entry (₹)": [e[0] for e in entries],
+        "SL (₹)": [e[1] for e in entries],
+        "Signal": [e[2] for e in entries],
+        "Inst Accum": [e[3] for e in entries],
+    }, SWING_COLUMNS, sort_by="Score")
 
 
 # =========================================================
@@ -430,55 +772,60 @@ def compute_vcp_status(row):
 # POSITIONAL TABLE
 # =========================================================
 
+POSITIONAL_BIAS_LABELS = [
+    "Bullish", "Structural Leader", "Trend Leader", "Accumulation"
+]
+
+
+@st.cache_data(ttl=900, show_spinner=False)
 def build_positional_table(df: pd.DataFrame) -> pd.DataFrame:
 
+    p = _prep(df)
+
     # --- Compute Score ---
-    df["score"] = df.apply(compute_positional_score, axis=1)
+    score = compute_positional_score_vec(df)
 
     # --- Filter ---
-    df = df[
-        (df["macd_status"].isin(["Expansion", "Early Expansion", "Positive"])) &
-        (df["score"] >= 70)
-    ].copy()
+    keep = p.macd_pos & (score >= 70)
+    df = df.loc[keep]
+    score = score[keep]
 
     # --- Trade Style ---
-    df["trade_style"] = df.apply(classify_positional_trade_style, axis=1)
+    trade_style = pd.Categorical(
+        classify_positional_trade_style_vec(df, score),
+        categories=POSITIONAL_STYLE_LABELS
+    )
 
     # --- Compute VCP ---
-    df["VCP Status"] = df.apply(compute_vcp_status, axis=1)
-
-    # --- Trade Bias (AFTER VCP exists) ---
-    df["trade_bias"] = df.apply(classify_positional_trade_bias, axis=1)
-
-    # --- Strength & Portfolio Action ---
-    df["trend_strength"] = np.where(df["score"] >= 85, "Strong", "Moderate")
-    df["portfolio_action"] = np.where(df["score"] >= 80, "Accumulate", "Hold")
-
-    # --- Sort & Rank ---
-    df = df.sort_values("score", ascending=False).reset_index(drop=True)
-    df["rank"] = df.index + 1
-
-    return df.rename(columns={
-        "symbol": "Symbol",
-        "macd_status": "MACD Status",
-        "score": "Score",
-        "price": "Price",
-        "pct_chg": "% Chg",
-        "adr": "ADR %",
-        "liquidity": "Liquidity",
-        "sector": "Sector",
-        "trade_bias": "Trade Bias",
-        "trade_style": "Trade Style",
-        "trend_strength": "Trend Strength",
-        "portfolio_action": "Portfolio Action",
-        "rank": "Rank"
-    })[[
-        "Rank","Symbol","Trade Bias","Trade Style","MACD Status",
-        "VCP Status",
-        "Score","Price","% Chg","ADR %","Liquidity",
-        "Trend Strength","Portfolio Action","Sector"
-    ]]
+    vcp_status = df.apply(compute_vcp_status, axis=1).to_numpy()
+
+    # --- Trade Bias (same rules as classify_positional_trade_bias) ---
+    trade_bias = pd.Categorical.from_codes(
+        np.select(
+            [
+                (score >= 85) & (vcp_status == "Confirmed VCP"),
+                score >= 80,
+                vcp_status == "Developing VCP",
+            ],
+            [1, 2, 3],
+            default=0
+        ).astype(np.int8),
+        categories=POSITIONAL_BIAS_LABELS
+    )
 
+    return _display_table(df, {
+        "Trade Bias": trade_bias,
+        "Trade Style": trade_style,
+        "VCP Status": vcp_status,
+        "Score": score,
+        # --- Strength & Portfolio Action ---
+        "Trend Strength": pd.Categorical.from_codes(
+            (score >= 85).astype(np.int8), categories=["Moderate", "Strong"]
+        ),
+        "Portfolio Action": pd.Categorical.from_codes(
+            (score >= 80).astype(np.int8), categories=["Hold", "Accumulate"]
+        ),
+    }, POSITIONAL_COLUMNS, sort_by="Score")
 
 
 # =========================================================
@@ -487,21 +834,19 @@ def build_positional_table(df: pd.DataFrame) -> pd.DataFrame:
 
 def near_miss_filter(df: pd.DataFrame) -> pd.DataFrame:
 
-    adr_near = df[
-        (df["liquidity"] >= 100) &
-        (df["adr"].between(2.0, 2.49)) &
-        (df["macd_status"].isin(["Early Expansion", "Expansion", "Positive"]))
-    ]
+    p = _prep(df)
 
-    macd_near = df[
-        (df["liquidity"] >= 100) &
-        (df["adr"] >= 2.5) &
-        (~df["macd_status"].isin(["Early Expansion", "Expansion", "Positive"]))
-    ]
+    # ADR just short of the swing cut, or ADR fine but MACD not bullish
+    adr_near = (p.adr >= 2.0) & (p.adr < 2.5) & p.macd_pos
+    macd_near = (p.adr >= 2.5) & ~p.macd_pos
 
-    return pd.concat([adr_near, macd_near]).copy()
-    
-    
+    return df.loc[p.liq_ok & (adr_near | macd_near)]
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def build_near_miss_table(df: pd.DataFrame) -> pd.DataFrame:
+
+    return _display_table(near_miss_filter(df), {}, NEAR_MISS_COLUMNS)
 
 
 # =========================================================
@@ -513,10 +858,13 @@ def metadata_footer(source_file, version="Legacy v1.3.0"):
     now = datetime.now()
     session = "LIVE" if 9 <= now.hour < 15 else "POST"
 
+    # Both stamps from one strftime call
+    run_ts, run_id = now.strftime("%d-%b-%Y %H:%M|%d%m%y-%H%M").split("|")
+
     return {
         "Source_File": source_file,
-        "Run_Timestamp": now.strftime("%d-%b-%Y %H:%M"),
-        "Run_ID": f"LEG-{now.strftime('%d%m%y-%H%M')}",
+        "Run_Timestamp": run_ts,
+        "Run_ID": f"LEG-{run_id}",
         "Version_Tag": version,
         "Market Session": session
     }
@@ -526,32 +874,48 @@ def metadata_footer(source_file, version="Legacy v1.3.0"):
 # STYLING HELPERS
 # =========================================================
 
+NUM_FORMAT = {
+    "Score": "{:.2f}",
+    "Price": "{:.2f}",
+    "% Chg": "{:.2f}",
+    "ADR %": "{:.2f}",
+    "Liquidity": "{:,.2f}",
+    "SL (₹)": "{:.2f}",
+}
+
+MACD_STYLE = {
+    "Expansion": "background-color: #c6e6c3",
+    "Early Expansion": "background-color: #d4f4dd",
+    "Positive": "background-color: #fff3cd",
+    "Negative": "background-color: #f8d7da"
+}
+
+TREND_STYLE = {
+    "Strong": "background-color: #c6e6c3",
+    "Moderate": "background-color: #fff3cd",
+    "Weak": "background-color: #f8d7da"
+}
+
+
 def color_macd(val):
 
-    if val == "Expansion":
-        return "background-color: #c6e6c3"
+    return MACD_STYLE.get(val, "")
 
-    if val == "Early Expansion":
-        return "background-color: #d4f4dd"
 
-    if val == "Positive":
-        return "background-color: #fff3cd"
+def color_trend(val):
 
-    if val == "Negative":
-        return "background-color: #f8d7da"
+    return TREND_STYLE.get(val, "")
 
-    return ""
 
+# Column-wise variants for Styler.apply: one Series.map per column
+# instead of a Python call per cell. Mapped as object, since fillna("")
+# on a categorical result rejects "" as a new category.
 
-def color_trend(val):
+def style_macd_col(col):
 
-    if val == "Strong":
-        return "background-color: #c6e6c3"
+    return col.astype(object).map(MACD_STYLE).fillna("")
 
-    if val == "Moderate":
-        return "background-color: #fff3cd"
 
-    if val == "Weak":
-        return "background-color: #f8d7da"
+def style_trend_col(col):
 
-    return ""
\ No newline at end of file
+    return col.astype(object).map(TREND_STYLE).fillna("")
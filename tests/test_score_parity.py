@@ -0,0 +1,80 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import legacy_logic as L
+
+
+# The table builders score and classify through the *_vec functions; the
+# row-wise versions are the reference. Both must agree on every row.
+
+STATUSES = ["Negative", "Positive", "Expansion", "Early Expansion", None]
+
+# Two-decimal sheet values, incl. ones that sit on a rule cut once scored
+# (667 / 3.33 -> positional 75.00, 668.5 / 3.54 -> swing 77.755 tie)
+LIQUIDITY = [0.0, 99.99, 100.0, 667.0, 668.5, 999.99, 1000.0, 2000.0, 2500.0, np.nan]
+ADR = [0.0, 2.49, 2.5, 3.33, 3.54, 4.17, 4.99, 5.0, 7.5, np.nan]
+PCT_CHG = [-1.5, 1.99, 2.0, np.nan]
+
+
+def _frame(categorical: bool) -> pd.DataFrame:
+
+    rows = list(itertools.product(LIQUIDITY, ADR, PCT_CHG, STATUSES))
+    df = pd.DataFrame(rows, columns=["liquidity", "adr", "pct_chg", "macd_status"])
+
+    if categorical:
+        df["macd_status"] = pd.Categorical(df["macd_status"], categories=L.MACD_LABELS)
+    else:
+        df["macd_status"] = df["macd_status"].astype(object)
+
+    return df
+
+
+@pytest.fixture(params=[True, False], ids=["categorical", "object"])
+def df(request):
+
+    return _frame(request.param)
+
+
+def test_swing_score(df):
+
+    expected = df.apply(L.compute_swing_score, axis=1).to_numpy(dtype=np.float64)
+    np.testing.assert_array_equal(L.compute_swing_score_vec(df), expected)
+
+
+def test_positional_score(df):
+
+    expected = df.apply(L.compute_positional_score, axis=1).to_numpy(dtype=np.float64)
+    np.testing.assert_array_equal(L.compute_positional_score_vec(df), expected)
+
+
+def test_swing_trade_style(df):
+
+    expected = df.apply(L.classify_swing_trade_style, axis=1).to_numpy()
+    np.testing.assert_array_equal(L.classify_swing_trade_style_vec(df), expected)
+
+
+def test_positional_trade_style(df):
+
+    score = L.compute_positional_score_vec(df)
+    expected = df.assign(score=score).apply(
+        L.classify_positional_trade_style, axis=1
+    ).to_numpy()
+
+    np.testing.assert_array_equal(
+        L.classify_positional_trade_style_vec(df, score), expected
+    )
+
+
+def test_round2_matches_round():
+
+    rng = np.random.default_rng(0)
+    x = np.concatenate([
+        np.round(rng.uniform(0, 100, 100_000), 3),
+        [77.755, 0.125, 2.675, 1.005, np.nan],
+    ])
+
+    expected = np.array([round(v, 2) for v in x.tolist()])
+    np.testing.assert_array_equal(L._round2(x), expected)
@@ -0,0 +1,12 @@
+import pandas as pd
+
+import legacy_logic as L
+
+
+def test_style_helpers_handle_missing_categoricals():
+
+    macd = pd.Series(pd.Categorical(["Positive", None], categories=L.MACD_LABELS))
+    trend = pd.Series(pd.Categorical(["Strong", None], categories=["Moderate", "Strong"]))
+
+    assert L.style_macd_col(macd).tolist() == [L.MACD_STYLE["Positive"], ""]
+    assert L.style_trend_col(trend).tolist() == [L.TREND_STYLE["Strong"], ""]